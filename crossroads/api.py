@@ -1,9 +1,17 @@
 """Flask API for Crossroads simulations."""
 
+import gzip
+import os
+import threading
+from functools import lru_cache
+
+import orjson
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 
-from .compare import calculate_cliff_analysis, compare
+from .compare import calculate_cliff_analysis, compare, warm_up
 from .events import (
     ChildAgingOut,
     Divorce,
@@ -17,40 +25,63 @@ from .events import (
     Retirement,
     Unemployment,
 )
+from .frontend import format_result_for_frontend
 from .household import Household, Person
-from .metadata import get_category, get_label, get_priority
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that uses orjson's C serializer for responses."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(
+            obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
 
+# PolicyEngine runs are CPU-bound, so cap how many run at once in a worker
+# process; extra requests queue here instead of thrashing the CPU.
+MAX_CONCURRENT_SIMULATIONS = int(
+    os.environ.get("CROSSROADS_MAX_CONCURRENT_SIMULATIONS", os.cpu_count() or 1)
+)
+_simulation_slots = threading.BoundedSemaphore(MAX_CONCURRENT_SIMULATIONS)
+
 
 def create_household_from_request(data: dict) -> Household:
     """Convert frontend household format to backend Household."""
-    members = []
+    age = data.get("age", 30)
 
     # Create head of household
-    head = Person(
-        age=data.get("age", 30),
-        employment_income=data.get("income", 0),
-        is_tax_unit_head=True,
-        has_esi=data.get("hasESI", False),
-    )
-    members.append(head)
+    members = [
+        Person(
+            age=age,
+            employment_income=data.get("income", 0),
+            is_tax_unit_head=True,
+            has_esi=data.get("hasESI", False),
+        )
+    ]
 
     # Add spouse if married
     filing_status = data.get("filingStatus", "single")
     if filing_status in ("married_jointly", "married_separately"):
-        spouse = Person(
-            age=data.get("spouseAge", data.get("age", 30)),
-            employment_income=data.get("spouseIncome", 0),
-            is_tax_unit_spouse=True,
-            has_esi=data.get("spouseHasESI", False),
+        spouse_age = data.get("spouseAge")
+        members.append(
+            Person(
+                age=age if spouse_age is None else spouse_age,
+                employment_income=data.get("spouseIncome", 0),
+                is_tax_unit_spouse=True,
+                has_esi=data.get("spouseHasESI", False),
+            )
         )
-        members.append(spouse)
 
     # Add children
-    for age in data.get("childAges", []):
-        members.append(Person(age=age))
+    members.extend([Person(age=child_age) for child_age in data.get("childAges", [])])
 
     return Household(
         state=data.get("state", "CA"),
@@ -59,133 +90,138 @@ def create_household_from_request(data: dict) -> Household:
     )
 
 
+# Events whose constructors take no request parameters
+_NO_ARG_EVENTS = {
+    "having_baby": NewChild,
+    "retiring": Retirement,
+    "divorce": Divorce,
+    "pregnancy": Pregnancy,
+    "medicare_transition": MedicareTransition,
+    "child_aging_out": ChildAgingOut,
+    "losing_esi": LosingESI,
+}
+
+
 def create_event_from_request(event_type: str, params: dict, household: Household):
     """Convert frontend event type to backend LifeEvent."""
-    event_map = {
-        "having_baby": lambda: NewChild(),
-        "moving_states": lambda: Move(new_state=params.get("newState", "TX")),
-        "getting_married": lambda: Marriage(
+    event_cls = _NO_ARG_EVENTS.get(event_type)
+    if event_cls is not None:
+        return event_cls()
+
+    if event_type == "moving_states":
+        return Move(new_state=params.get("newState", "TX"))
+    elif event_type == "getting_married":
+        return Marriage(
             spouse_age=params.get("spouseAge", 30),
             spouse_employment_income=params.get("spouseIncome", 0),
             spouse_children=[Person(age=age) for age in params.get("spouseChildAges", [])],
             spouse_has_esi=params.get("spouseHasESI", False),
-        ),
-        "changing_income": lambda: JobChange(
+        )
+    elif event_type == "changing_income":
+        return JobChange(
             new_income=household.members[0].employment_income
             * (1 + params.get("percentChange", 20) / 100)
-        ),
-        "retiring": lambda: Retirement(),
-        "divorce": lambda: Divorce(),
-        "pregnancy": lambda: Pregnancy(),
-        "unemployment": lambda: Unemployment(
+        )
+    elif event_type == "unemployment":
+        return Unemployment(
             unemployment_compensation=params.get("unemploymentBenefits", 15000)
-        ),
-        "medicare_transition": lambda: MedicareTransition(),
-        "child_aging_out": lambda: ChildAgingOut(),
-        "losing_esi": lambda: LosingESI(),
-    }
-
-    if event_type not in event_map:
-        raise ValueError(f"Unknown event type: {event_type}")
-
-    return event_map[event_type]()
-
-
-def format_result_for_frontend(result) -> dict:
-    """Convert ComparisonResult to frontend-expected format."""
-    metrics = []
-    for var_name, change in result.changes.items():
-        if var_name == "household_net_income":
-            continue
-        metrics.append({
-            "name": var_name,
-            "label": get_label(var_name),
-            "before": change.before,
-            "after": change.after,
-            "category": get_category(var_name),
-            "priority": get_priority(var_name),
-        })
-
-    # Calculate totals
-    total_tax_before = sum(
-        c.before for name, c in result.changes.items() if get_category(name) == "tax"
-    )
-    total_tax_after = sum(
-        c.after for name, c in result.changes.items() if get_category(name) == "tax"
-    )
-    total_benefits_before = sum(
-        c.before for name, c in result.changes.items()
-        if get_category(name) in ("benefit", "credit")
-    )
-    total_benefits_after = sum(
-        c.after for name, c in result.changes.items()
-        if get_category(name) in ("benefit", "credit")
-    )
+        )
+
+    raise ValueError(f"Unknown event type: {event_type}")
 
-    response = {
-        "before": {
-            "netIncome": result.net_income_before,
-            "totalTax": total_tax_before,
-            "totalBenefits": total_benefits_before,
-            "metrics": metrics,
-        },
-        "after": {
-            "netIncome": result.net_income_after,
-            "totalTax": total_tax_after,
-            "totalBenefits": total_benefits_after,
-            "metrics": [{**m, "before": m["after"]} for m in metrics],
-        },
-        "diff": {
-            "netIncome": result.net_income_change,
-            "totalTax": total_tax_after - total_tax_before,
-            "totalBenefits": total_benefits_after - total_benefits_before,
-        },
-        "event": {
-            "name": result.event.name,
-            "description": result.event.description,
-        },
-    }
-
-    # Add healthcare coverage info if available
-    if result.healthcare_before:
-        response["healthcareBefore"] = result.healthcare_before.to_dict()
-    if result.healthcare_after:
-        response["healthcareAfter"] = result.healthcare_after.to_dict()
 
+@lru_cache(maxsize=256)
+def _simulate_payload(payload: bytes) -> dict:
+    """
+    Run a simulation for a canonical JSON request payload.
+
+    Simulations are deterministic in the request body, so identical
+    payloads are served from memory instead of re-running PolicyEngine.
+    """
+    data = orjson.loads(payload)
+    event_data = data.get("lifeEvent") or {}
+    household = create_household_from_request(data.get("household") or {})
+    event = create_event_from_request(
+        event_data.get("type"),
+        event_data.get("params") or {},
+        household,
+    )
+    with _simulation_slots:
+        result = compare(household, event)
+    return format_result_for_frontend(result)
+
+
+# Smallest JSON response worth gzipping
+COMPRESS_MIN_SIZE = 500
+
+
+@app.after_request
+def compress_response(response):
+    """Gzip JSON responses for clients that accept it."""
+    if response.mimetype != "application/json" or response.direct_passthrough:
+        return response
+    response.vary.add("Accept-Encoding")
+    # Parsed, so "gzip;q=0" counts as a refusal
+    if not request.accept_encodings["gzip"]:
+        return response
+    if "Content-Encoding" in response.headers:
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers["Content-Encoding"] = "gzip"
     return response
 
 
+# Message prefix for unexpected failures, by endpoint
+_FAILURE_MESSAGES = {
+    "simulate": "Simulation failed",
+    "cliff_analysis": "Cliff analysis failed",
+}
+
+
+@app.errorhandler(ValueError)
+def handle_value_error(e: ValueError):
+    """Report invalid households and life events as client errors."""
+    return jsonify({"error": str(e)}), 400
+
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e: Exception):
+    """Log unexpected failures and report them as server errors."""
+    if isinstance(e, HTTPException):
+        return e
+    app.logger.exception("Unhandled error in %s", request.endpoint)
+    message = _FAILURE_MESSAGES.get(request.endpoint, "Request failed")
+    return jsonify({"error": f"{message}: {e}"}), 500
+
+
 @app.route("/api/simulate", methods=["POST"])
 def simulate():
     """Run a life event simulation."""
-    try:
-        data = request.get_json()
-        household = create_household_from_request(data.get("household", {}))
-        event = create_event_from_request(
-            data.get("lifeEvent", {}).get("type"),
-            data.get("lifeEvent", {}).get("params", {}),
-            household,
-        )
-        result = compare(household, event)
-        return jsonify(format_result_for_frontend(result))
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
-    except Exception as e:
-        return jsonify({"error": f"Simulation failed: {str(e)}"}), 500
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return jsonify(_simulate_payload(payload))
 
 
 @app.route("/api/cliff", methods=["POST"])
 def cliff_analysis():
     """Calculate benefit cliffs across income levels."""
-    try:
-        data = request.get_json()
-        household = create_household_from_request(data.get("household", {}))
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    household = create_household_from_request(data.get("household") or {})
 
-        # Optional parameters for income range
-        income_min = data.get("incomeMin", 0)
-        income_max = data.get("incomeMax", 150000)
-        num_points = min(data.get("numPoints", 30), 50)  # Cap at 50 for performance
+    # Optional parameters for income range
+    income_min = data.get("incomeMin", 0)
+    income_max = data.get("incomeMax", 150000)
+    num_points = min(data.get("numPoints", 30), 50)  # Cap at 50 for performance
 
+    with _simulation_slots:
         results = calculate_cliff_analysis(
             household,
             income_min=income_min,
@@ -193,17 +229,13 @@ def cliff_analysis():
             num_points=num_points,
         )
 
-        # Find the current income point for highlighting
-        current_income = household.members[0].employment_income if household.members else 0
+    # Find the current income point for highlighting
+    current_income = household.members[0].employment_income if household.members else 0
 
-        return jsonify({
-            "data": results,
-            "currentIncome": current_income,
-        })
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
-    except Exception as e:
-        return jsonify({"error": f"Cliff analysis failed: {str(e)}"}), 500
+    return jsonify({
+        "data": results,
+        "currentIncome": current_income,
+    })
 
 
 @app.route("/api/health", methods=["GET"])
@@ -212,5 +244,11 @@ def health():
     return jsonify({"status": "ok"})
 
 
+# Move PolicyEngine's one-time setup out of the first user request
+if os.environ.get("CROSSROADS_WARMUP") == "1":
+    warm_up()
+
+
 if __name__ == "__main__":
+    # Development server only; production runs under gunicorn.conf.py
     app.run(host="0.0.0.0", port=8080)
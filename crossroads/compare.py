@@ -2,17 +2,40 @@
 
 from __future__ import annotations
 
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
+import orjson
 from policyengine_us import Simulation
 
+from .events import NewChild
 from .events.base import LifeEvent
-from .household import Household
-
+from .household import Household, Person
+
+# Set CROSSROADS_PARALLEL_SIMULATIONS=1 to run compare()'s before and after
+# simulations in two worker processes. Off by default: each worker pays
+# PolicyEngine's startup cost once, and servers that already run a worker
+# per core gain nothing from it.
+PARALLEL_SIMULATIONS = os.environ.get("CROSSROADS_PARALLEL_SIMULATIONS") == "1"
+_simulation_pool: ProcessPoolExecutor | None = None
+_simulation_pool_lock = threading.Lock()
+
+# Simulation outputs keyed by canonical situation, so repeated situations
+# (the same baseline against several events, no-op events, cliff points
+# revisited) skip PolicyEngine entirely. Outputs are shared; treat them as
+# read-only.
+SIMULATION_CACHE_SIZE = 256
+_simulation_cache: OrderedDict[bytes, SimulationOutput] = OrderedDict()
+_simulation_cache_lock = threading.Lock()
 
 # All variables to track in comparisons - comprehensive list
-OUTPUT_VARIABLES = [
+OUTPUT_VARIABLES = (
     # Net income (summary)
     "household_net_income",
     # Gross income
@@ -120,10 +143,17 @@ OUTPUT_VARIABLES = [
     "hi_eitc",
     "ut_eitc",
     "ut_ctc",
-]
+)
+
+# Output variables defined by the loaded country package; looking up the
+# rest would only raise and be zeroed on every simulation
+_COMPUTABLE_VARIABLES = tuple(
+    var for var in OUTPUT_VARIABLES
+    if var in Simulation.default_tax_benefit_system_instance.variables
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class PersonHealthcare:
     """Healthcare coverage info for a single person."""
 
@@ -148,7 +178,7 @@ class PersonHealthcare:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class HealthcareCoverage:
     """Healthcare coverage breakdown for the household."""
 
@@ -190,7 +220,7 @@ class HealthcareCoverage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class BenefitChange:
     """Represents a change in a specific benefit or tax."""
 
@@ -228,7 +258,20 @@ class BenefitChange:
         )
 
 
-@dataclass
+# Variables summed into tax liability and checked for gained/lost benefits
+_TAX_VARS = (
+    "income_tax", "state_income_tax", "employee_payroll_tax", "self_employment_tax",
+)
+_BENEFIT_VARS = (
+    "snap", "tanf", "ssi", "earned_income_tax_credit",
+    "child_tax_credit", "refundable_ctc", "premium_tax_credit",
+)
+
+# Stand-in for variables missing from a comparison
+_ZERO_CHANGE = BenefitChange("", 0.0, 0.0)
+
+
+@dataclass(slots=True)
 class ComparisonResult:
     """Result of comparing a household before and after a life event."""
 
@@ -239,13 +282,38 @@ class ComparisonResult:
     healthcare_before: HealthcareCoverage | None = None
     healthcare_after: HealthcareCoverage | None = None
 
+    # Derived aggregates, computed once from changes in __post_init__
+    _tax_liability_before: float = field(init=False, repr=False, compare=False)
+    _tax_liability_after: float = field(init=False, repr=False, compare=False)
+    _new_benefits: list[str] = field(init=False, repr=False, compare=False)
+    _lost_benefits: list[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        changes = self.changes
+        tax_before = tax_after = 0.0
+        for var in _TAX_VARS:
+            change = changes.get(var, _ZERO_CHANGE)
+            tax_before += change.before
+            tax_after += change.after
+        self._tax_liability_before = tax_before
+        self._tax_liability_after = tax_after
+        self._new_benefits = []
+        self._lost_benefits = []
+        for var in _BENEFIT_VARS:
+            if var in changes:
+                change = changes[var]
+                if change.before == 0 and change.after > 0:
+                    self._new_benefits.append(var)
+                elif change.before > 0 and change.after == 0:
+                    self._lost_benefits.append(var)
+
     @property
     def net_income_before(self) -> float:
-        return self.changes.get("household_net_income", BenefitChange("", 0, 0)).before
+        return self.changes.get("household_net_income", _ZERO_CHANGE).before
 
     @property
     def net_income_after(self) -> float:
-        return self.changes.get("household_net_income", BenefitChange("", 0, 0)).after
+        return self.changes.get("household_net_income", _ZERO_CHANGE).after
 
     @property
     def net_income_change(self) -> float:
@@ -254,20 +322,12 @@ class ComparisonResult:
     @property
     def tax_liability_before(self) -> float:
         """Total tax liability before the event."""
-        taxes = ["income_tax", "state_income_tax", "employee_payroll_tax", "self_employment_tax"]
-        return sum(
-            self.changes.get(t, BenefitChange("", 0, 0)).before
-            for t in taxes
-        )
+        return self._tax_liability_before
 
     @property
     def tax_liability_after(self) -> float:
         """Total tax liability after the event."""
-        taxes = ["income_tax", "state_income_tax", "employee_payroll_tax", "self_employment_tax"]
-        return sum(
-            self.changes.get(t, BenefitChange("", 0, 0)).after
-            for t in taxes
-        )
+        return self._tax_liability_after
 
     @property
     def tax_change(self) -> float:
@@ -276,65 +336,41 @@ class ComparisonResult:
     @property
     def new_benefits(self) -> list[str]:
         """Benefits that were zero before but positive after."""
-        result = []
-        benefit_vars = [
-            "snap", "tanf", "ssi", "earned_income_tax_credit",
-            "child_tax_credit", "refundable_ctc", "premium_tax_credit",
-        ]
-        for var in benefit_vars:
-            if var in self.changes:
-                change = self.changes[var]
-                if change.before == 0 and change.after > 0:
-                    result.append(var)
-        return result
+        return self._new_benefits
 
     @property
     def lost_benefits(self) -> list[str]:
         """Benefits that were positive before but zero after."""
-        result = []
-        benefit_vars = [
-            "snap", "tanf", "ssi", "earned_income_tax_credit",
-            "child_tax_credit", "refundable_ctc", "premium_tax_credit",
-        ]
-        for var in benefit_vars:
-            if var in self.changes:
-                change = self.changes[var]
-                if change.before > 0 and change.after == 0:
-                    result.append(var)
-        return result
+        return self._lost_benefits
 
     def summary(self) -> str:
         """Generate a human-readable summary of the comparison."""
-        lines = [
-            f"Life Event: {self.event.name}",
-            f"  {self.event.description}",
-            "",
-            "Net Income:",
-            f"  Before: ${self.net_income_before:,.2f}",
-            f"  After:  ${self.net_income_after:,.2f}",
-            f"  Change: ${self.net_income_change:+,.2f}",
-            "",
-            "Tax Liability:",
-            f"  Before: ${self.tax_liability_before:,.2f}",
-            f"  After:  ${self.tax_liability_after:,.2f}",
-            f"  Change: ${self.tax_change:+,.2f}",
-        ]
+        text = (
+            f"Life Event: {self.event.name}\n"
+            f"  {self.event.description}\n"
+            "\n"
+            "Net Income:\n"
+            f"  Before: ${self.net_income_before:,.2f}\n"
+            f"  After:  ${self.net_income_after:,.2f}\n"
+            f"  Change: ${self.net_income_change:+,.2f}\n"
+            "\n"
+            "Tax Liability:\n"
+            f"  Before: ${self.tax_liability_before:,.2f}\n"
+            f"  After:  ${self.tax_liability_after:,.2f}\n"
+            f"  Change: ${self.tax_change:+,.2f}"
+        )
 
         if self.new_benefits:
-            lines.append("")
-            lines.append("New Benefits Gained:")
-            for b in self.new_benefits:
-                amount = self.changes[b].after
-                lines.append(f"  - {b}: ${amount:,.2f}")
+            text += "\n\nNew Benefits Gained:\n" + "\n".join(
+                f"  - {b}: ${self.changes[b].after:,.2f}" for b in self.new_benefits
+            )
 
         if self.lost_benefits:
-            lines.append("")
-            lines.append("Benefits Lost:")
-            for b in self.lost_benefits:
-                amount = self.changes[b].before
-                lines.append(f"  - {b}: ${amount:,.2f}")
+            text += "\n\nBenefits Lost:\n" + "\n".join(
+                f"  - {b}: ${self.changes[b].before:,.2f}" for b in self.lost_benefits
+            )
 
-        return "\n".join(lines)
+        return text
 
     def to_dict(self) -> dict[str, Any]:
         """
@@ -373,102 +409,219 @@ class ComparisonResult:
             result["healthcare_after"] = self.healthcare_after.to_dict()
         return result
 
+    def to_json(self) -> bytes:
+        """Serialize to_dict() as UTF-8 JSON bytes using orjson."""
+        return orjson.dumps(
+            self.to_dict(),
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
 
-def _run_simulation(situation: dict[str, Any], year: int) -> tuple[dict[str, float], Simulation]:
-    """Run a PolicyEngine simulation and extract key outputs.
+@dataclass(frozen=True)
+class SimulationOutput:
+    """
+    Outputs of one PolicyEngine simulation, in picklable form.
 
-    Returns both the aggregated results and the simulation object for
-    further per-person analysis.
+    Holds the household totals for OUTPUT_VARIABLES plus the per-person
+    values needed for healthcare coverage, so the heavy Simulation object
+    doesn't need to outlive the run (or cross a process boundary).
     """
+
+    totals: dict[str, float]
+    medicaid: list[float]
+    chip: list[float]
+
+
+def _simulate(situation: dict[str, Any], year: int) -> SimulationOutput:
+    """Run a PolicyEngine simulation and extract key outputs."""
     sim = Simulation(situation=situation)
-    results = {}
+    # Variables the country package doesn't define stay at zero
+    results = dict.fromkeys(OUTPUT_VARIABLES, 0.0)
 
-    for var in OUTPUT_VARIABLES:
+    for var in _COMPUTABLE_VARIABLES:
         try:
             value = sim.calculate(var, year)
             # Sum across all entities if array
-            if hasattr(value, "__iter__"):
-                results[var] = float(sum(value))
+            if isinstance(value, np.ndarray):
+                results[var] = float(value.sum())
             else:
                 results[var] = float(value)
         except Exception:
-            results[var] = 0.0
+            pass
 
-    return results, sim
+    num_people = len(situation["people"])
+    return SimulationOutput(
+        totals=results,
+        medicaid=_calculate_per_person(sim, "medicaid", year, num_people),
+        chip=_calculate_per_person(sim, "chip", year, num_people),
+    )
 
 
-def _get_person_label(index: int, household: Household) -> str:
-    """Get a human-readable label for a person by index."""
-    if index >= len(household.members):
-        return f"Person {index + 1}"
+def _run_simulation(situation: dict[str, Any], year: int) -> SimulationOutput:
+    """Run a PolicyEngine simulation, reusing outputs for identical situations."""
+    key = _situation_key(situation, year)
+    output = _get_cached_output(key)
+    if output is None:
+        output = _simulate(situation, year)
+        _cache_output(key, output)
+    return output
 
-    member = household.members[index]
-    if member.is_tax_unit_head:
-        return "You"
-    if member.is_tax_unit_spouse:
-        return "Spouse"
 
-    # Count children to get child number
-    child_num = 0
-    for i, m in enumerate(household.members):
-        if not m.is_tax_unit_head and not m.is_tax_unit_spouse:
-            child_num += 1
-            if i == index:
-                return f"Child {child_num}"
+def _situation_key(situation: dict[str, Any], year: int) -> bytes:
+    """Canonical, hashable form of a situation for the simulation cache."""
+    return orjson.dumps(
+        [year, situation], option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
 
-    return f"Person {index + 1}"
 
+def _get_cached_output(key: bytes) -> SimulationOutput | None:
+    """Look up a cached simulation output, marking it recently used."""
+    with _simulation_cache_lock:
+        output = _simulation_cache.get(key)
+        if output is not None:
+            _simulation_cache.move_to_end(key)
+        return output
 
-def _extract_healthcare_coverage(
-    sim: Simulation,
-    household: Household,
-    year: int,
-) -> HealthcareCoverage:
-    """Extract per-person healthcare coverage from a simulation."""
-    num_people = len(household.members)
 
-    # Get per-person healthcare values
-    try:
-        medicaid_values = sim.calculate("medicaid", year)
-    except Exception:
-        medicaid_values = [0.0] * num_people
+def _cache_output(key: bytes, output: SimulationOutput) -> None:
+    """Store a simulation output, evicting the least recently used entry."""
+    with _simulation_cache_lock:
+        _simulation_cache[key] = output
+        _simulation_cache.move_to_end(key)
+        if len(_simulation_cache) > SIMULATION_CACHE_SIZE:
+            _simulation_cache.popitem(last=False)
+
+
+def _pad_per_person(values: list[float], num_people: int) -> np.ndarray:
+    """Per-person values as an array of length num_people, zero-filled."""
+    padded = np.zeros(num_people)
+    count = min(len(values), num_people)
+    padded[:count] = values[:count]
+    return padded
 
-    try:
-        chip_values = sim.calculate("chip", year)
-    except Exception:
-        chip_values = [0.0] * num_people
 
-    # Get household-level PTC
+def _calculate_per_person(
+    sim: Simulation, variable: str, year: int, num_people: int
+) -> list[float]:
+    """Calculate a person-level variable, falling back to zeros on failure."""
     try:
-        ptc_value = float(sum(sim.calculate("premium_tax_credit", year)))
+        return sim.calculate(variable, year).astype(float).tolist()
     except Exception:
-        ptc_value = 0.0
+        return [0.0] * num_people
+
+
+def _run_simulations(
+    before_situation: dict[str, Any],
+    before_year: int,
+    after_situation: dict[str, Any],
+    after_year: int,
+) -> tuple[SimulationOutput, SimulationOutput]:
+    """Run the before and after simulations, in parallel if enabled."""
+    if not PARALLEL_SIMULATIONS:
+        return (
+            _run_simulation(before_situation, before_year),
+            _run_simulation(after_situation, after_year),
+        )
 
-    has_ptc = ptc_value > 0
+    pool = _get_simulation_pool()
+    before_key = _situation_key(before_situation, before_year)
+    after_key = _situation_key(after_situation, after_year)
+    outputs = {}
+    futures = {}
+    for key, situation, year in (
+        (before_key, before_situation, before_year),
+        (after_key, after_situation, after_year),
+    ):
+        output = _get_cached_output(key)
+        if output is not None:
+            outputs[key] = output
+        elif key not in futures:
+            futures[key] = pool.submit(_simulate, situation, year)
+
+    for key, future in futures.items():
+        outputs[key] = future.result()
+        _cache_output(key, outputs[key])
+    return outputs[before_key], outputs[after_key]
+
+
+def _get_simulation_pool() -> ProcessPoolExecutor:
+    """Return the shared simulation process pool, creating it on first use."""
+    global _simulation_pool
+    with _simulation_pool_lock:
+        if _simulation_pool is None:
+            # Spawn, not fork: forking a multithreaded server (e.g. gunicorn's
+            # gthread workers) can copy held locks into the child and deadlock
+            _simulation_pool = ProcessPoolExecutor(
+                max_workers=2, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _simulation_pool
+
+
+def _reset_simulation_pool() -> None:
+    """Forget the parent's pool in a forked child, where it no longer works."""
+    global _simulation_pool, _simulation_pool_lock
+    # The child's copy has no manager thread, so submitting to it would hang
+    _simulation_pool = None
+    _simulation_pool_lock = threading.Lock()
+
+
+# e.g. gunicorn workers forked from a master that already ran a comparison
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_simulation_pool)
+
+
+def _get_person_labels(household: Household) -> list[str]:
+    """Get human-readable labels for every household member, in order."""
+    labels = []
+    child_num = 0
+    for member in household.members:
+        if member.is_tax_unit_head:
+            labels.append("You")
+        elif member.is_tax_unit_spouse:
+            labels.append("Spouse")
+        else:
+            child_num += 1
+            labels.append(f"Child {child_num}")
+    return labels
 
-    # Build per-person coverage
-    people = []
-    for i in range(num_people):
-        member = household.members[i]
-        medicaid_amount = float(medicaid_values[i]) if i < len(medicaid_values) else 0.0
-        chip_amount = float(chip_values[i]) if i < len(chip_values) else 0.0
 
-        # Check ESI first (from household member data)
-        has_esi = member.has_esi
+def _extract_healthcare_coverage(
+    output: SimulationOutput,
+    household: Household,
+) -> HealthcareCoverage:
+    """Extract per-person healthcare coverage from a simulation's outputs."""
+    num_people = len(household.members)
+    medicaid_values = _pad_per_person(output.medicaid, num_people)
+    chip_values = _pad_per_person(output.chip, num_people)
+
+    # Household-level PTC
+    has_ptc = output.totals.get("premium_tax_credit", 0.0) > 0
 
-        on_medicaid = medicaid_amount > 0 and not has_esi
-        on_chip = chip_amount > 0 and not has_esi
-        # If not on ESI/Medicaid/CHIP but household has PTC, person is on marketplace
-        on_marketplace = has_ptc and not has_esi and not on_medicaid and not on_chip
+    # Coverage flags for everyone at once; ESI comes from household member data
+    has_esi = np.array([m.has_esi for m in household.members], dtype=bool)
+    on_medicaid = (medicaid_values > 0) & ~has_esi
+    on_chip = (chip_values > 0) & ~has_esi
+    # If not on ESI/Medicaid/CHIP but household has PTC, person is on marketplace
+    on_marketplace = ~(has_esi | on_medicaid | on_chip) & has_ptc
 
-        people.append(PersonHealthcare(
+    # Build per-person coverage
+    labels = _get_person_labels(household)
+    people = [
+        PersonHealthcare(
             person_index=i,
-            label=_get_person_label(i, household),
-            esi=has_esi,
-            medicaid=on_medicaid,
-            chip=on_chip,
-            marketplace=on_marketplace,
+            label=labels[i],
+            esi=esi,
+            medicaid=medicaid,
+            chip=chip,
+            marketplace=marketplace,
+        )
+        for i, (esi, medicaid, chip, marketplace) in enumerate(zip(
+            has_esi.tolist(),
+            on_medicaid.tolist(),
+            on_chip.tolist(),
+            on_marketplace.tolist(),
         ))
+    ]
 
     return HealthcareCoverage(people=people, has_ptc=has_ptc)
 
@@ -504,24 +657,24 @@ def compare(
     after_situation = after_household.to_situation()
 
     # Run simulations
-    before_results, before_sim = _run_simulation(before_situation, household.year)
-    after_results, after_sim = _run_simulation(after_situation, after_household.year)
+    before_output, after_output = _run_simulations(
+        before_situation, household.year, after_situation, after_household.year
+    )
+    before_results = before_output.totals
+    after_results = after_output.totals
 
     # Extract healthcare coverage
-    healthcare_before = _extract_healthcare_coverage(before_sim, household, household.year)
-    healthcare_after = _extract_healthcare_coverage(after_sim, after_household, after_household.year)
+    healthcare_before = _extract_healthcare_coverage(before_output, household)
+    healthcare_after = _extract_healthcare_coverage(after_output, after_household)
 
     # Build changes dictionary
     vars_to_compare = variables or OUTPUT_VARIABLES
-    changes = {}
-    for var in vars_to_compare:
-        before_val = before_results.get(var, 0.0)
-        after_val = after_results.get(var, 0.0)
-        changes[var] = BenefitChange(
-            name=var,
-            before=before_val,
-            after=after_val,
-        )
+    before_get = before_results.get
+    after_get = after_results.get
+    changes = {
+        var: BenefitChange(var, before_get(var, 0.0), after_get(var, 0.0))
+        for var in vars_to_compare
+    }
 
     return ComparisonResult(
         event=event,
@@ -577,7 +730,7 @@ def calculate_cliff_analysis(
 
         # Run simulation
         situation = modified_household.to_situation()
-        sim_results, _ = _run_simulation(situation, modified_household.year)
+        sim_results = _run_simulation(situation, modified_household.year).totals
 
         # Categorize results
         total_tax = 0.0
@@ -651,3 +804,17 @@ def calculate_cliff_analysis(
             results[i]["cliffCauses"] = cliff_causes[:5]  # Top 5 causes
 
     return results
+
+
+def warm_up() -> None:
+    """
+    Run one small comparison's simulations in this process.
+
+    This moves PolicyEngine's one-time setup (parameter loading and the
+    lazily filled formula caches) out of the first real comparison. It
+    bypasses the simulation pool: a preloading server warms up in its master,
+    and forked workers only inherit what was set up in-process.
+    """
+    household = Household(state="CA", members=[Person(age=30, employment_income=30000)])
+    for h in (household, NewChild().apply(household)):
+        _simulate(h.to_situation(), h.year)
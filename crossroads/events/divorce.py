@@ -33,24 +33,16 @@ class Divorce(LifeEvent):
         """Remove the spouse (and optionally some children) from the household."""
         new_household = household.copy()
 
-        # Find and remove spouse
-        spouse_idx = None
-        for i, member in enumerate(new_household.members):
-            if member.is_tax_unit_spouse:
-                spouse_idx = i
-                break
-
         # Collect indices to remove (spouse + any children leaving)
         indices_to_remove = set()
-        if spouse_idx is not None:
-            indices_to_remove.add(spouse_idx)
+        spouse_index = new_household.spouse_index()
+        if spouse_index is not None:
+            indices_to_remove.add(spouse_index)
 
         if self.children_leave_with_spouse:
             indices_to_remove.update(self.children_leave_with_spouse)
 
-        # Remove in reverse order to maintain correct indices
-        for idx in sorted(indices_to_remove, reverse=True):
-            new_household.members.pop(idx)
+        new_household.remove_members(indices_to_remove)
 
         return new_household
 
@@ -58,8 +50,7 @@ class Divorce(LifeEvent):
         """Validate the divorce event."""
         errors = []
 
-        has_spouse = any(m.is_tax_unit_spouse for m in household.members)
-        if not has_spouse:
+        if not household.has_spouse:
             errors.append("Household has no spouse to divorce")
 
         if self.children_leave_with_spouse:
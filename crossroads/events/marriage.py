@@ -43,17 +43,14 @@ class Marriage(LifeEvent):
             is_tax_unit_spouse=True,
             has_esi=self.spouse_has_esi,
         )
-        new_household.add_member(spouse)
-
-        for child in self.spouse_children:
-            new_household.add_member(child)
+        new_household.add_members([spouse, *self.spouse_children])
 
         return new_household
 
     def validate(self, household: Household) -> list[str]:
         """Validate the marriage is valid."""
         errors = []
-        if any(m.is_tax_unit_spouse for m in household.members):
+        if household.has_spouse:
             errors.append("Household already has a spouse")
         if self.spouse_age < 18:
             errors.append("Spouse must be 18 or older")
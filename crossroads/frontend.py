@@ -0,0 +1,80 @@
+"""Response formatting shared by the Flask and Modal frontends."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .metadata import BENEFIT_BUCKET, TAX_BUCKET, VAR_TO_BUCKET, get_metadata
+
+
+@dataclass(slots=True)
+class Metric:
+    """A single variable's before/after values as sent to the frontend."""
+
+    name: str
+    label: str
+    before: float
+    after: float
+    category: str
+    priority: int
+
+
+def format_result_for_frontend(result) -> dict:
+    """Convert ComparisonResult to frontend-expected format."""
+    metrics = []
+    after_metrics = []
+    total_tax_before = total_tax_after = 0.0
+    total_benefits_before = total_benefits_after = 0.0
+
+    # Net income is reported on its own, not as a metric
+    changes = dict(result.changes)
+    changes.pop("household_net_income", None)
+
+    # Build metrics and totals in a single pass over the changes
+    bucket_of = VAR_TO_BUCKET.get
+    for var_name, change in changes.items():
+        before, after = change.before, change.after
+        label, category, priority = get_metadata(var_name)
+        metrics.append(Metric(var_name, label, before, after, category, priority))
+        # The "after" view reports the post-event value in both fields
+        after_metrics.append(Metric(var_name, label, after, after, category, priority))
+        # Unknown variables default to the benefit category, so total them as such
+        bucket = bucket_of(var_name, BENEFIT_BUCKET)
+        if bucket == TAX_BUCKET:
+            total_tax_before += before
+            total_tax_after += after
+        elif bucket == BENEFIT_BUCKET:
+            total_benefits_before += before
+            total_benefits_after += after
+
+    response = {
+        "before": {
+            "netIncome": result.net_income_before,
+            "totalTax": total_tax_before,
+            "totalBenefits": total_benefits_before,
+            "metrics": metrics,
+        },
+        "after": {
+            "netIncome": result.net_income_after,
+            "totalTax": total_tax_after,
+            "totalBenefits": total_benefits_after,
+            "metrics": after_metrics,
+        },
+        "diff": {
+            "netIncome": result.net_income_change,
+            "totalTax": total_tax_after - total_tax_before,
+            "totalBenefits": total_benefits_after - total_benefits_before,
+        },
+        "event": {
+            "name": result.event.name,
+            "description": result.event.description,
+        },
+    }
+
+    # Add healthcare coverage info if available
+    if result.healthcare_before:
+        response["healthcareBefore"] = result.healthcare_before.to_dict()
+    if result.healthcare_after:
+        response["healthcareAfter"] = result.healthcare_after.to_dict()
+
+    return response
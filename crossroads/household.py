@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
-import copy
-from dataclasses import dataclass, field
-from typing import Any
+from dataclasses import dataclass, field, replace
+from typing import Any, Iterable
 
 
-@dataclass
+@dataclass(slots=True)
 class Person:
     """A person in a household."""
 
@@ -36,8 +35,12 @@ class Person:
         # display, but not passed to PolicyEngine (no such variable exists)
         return result
 
+    def clone(self) -> Person:
+        """Create an independent copy of this person."""
+        return replace(self)
 
-@dataclass
+
+@dataclass(slots=True)
 class Household:
     """
     A household that can be simulated through PolicyEngine US.
@@ -60,11 +63,21 @@ class Household:
 
     def _assign_tax_unit_roles(self) -> None:
         """Assign head and spouse roles if not already set."""
-        adults = [m for m in self.members if m.age >= 18]
-        if adults and not any(m.is_tax_unit_head for m in self.members):
-            adults[0].is_tax_unit_head = True
-            if len(adults) > 1 and not any(m.is_tax_unit_spouse for m in self.members):
-                adults[1].is_tax_unit_spouse = True
+        has_head = False
+        has_spouse = False
+        for member in self.members:
+            if member.is_tax_unit_head:
+                has_head = True
+            if member.is_tax_unit_spouse:
+                has_spouse = True
+
+        if has_head:
+            return
+        adults = [i for i, m in enumerate(self.members) if m.age >= 18]
+        if adults:
+            self.members[adults[0]].is_tax_unit_head = True
+            if len(adults) > 1 and not has_spouse:
+                self.members[adults[1]].is_tax_unit_spouse = True
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Household:
@@ -99,43 +112,34 @@ class Household:
             A dictionary in PolicyEngine situation format ready for simulation.
         """
         people = {}
-        tax_unit_members = []
-        family_members = []
-        spm_unit_members = []
-        household_members = []
-
-        for i, member in enumerate(self.members):
-            person_id = f"person_{i}"
-            people[person_id] = member.to_situation_dict(self.year)
-            tax_unit_members.append(person_id)
-            family_members.append(person_id)
-            spm_unit_members.append(person_id)
-            household_members.append(person_id)
-
-        # Build the head and spouse lists for tax unit
+        # One id list shared by every entity; PolicyEngine only reads it
+        person_ids = []
         head = None
         spouse = None
-        dependents = []
+
         for i, member in enumerate(self.members):
             person_id = f"person_{i}"
+            person = member.to_situation_dict(self.year)
+            people[person_id] = person
+            person_ids.append(person_id)
+
+            # Track head and spouse; everyone else is a dependent
             if member.is_tax_unit_head:
                 head = person_id
             elif member.is_tax_unit_spouse:
                 spouse = person_id
             else:
-                dependents.append(person_id)
+                person["is_tax_unit_dependent"] = {self.year: True}
 
-        tax_unit = {"members": tax_unit_members}
+        tax_unit = {"members": person_ids}
         # Mark head/spouse roles on the people, not on tax_unit
         if head:
             people[head]["is_tax_unit_head"] = {self.year: True}
         if spouse:
             people[spouse]["is_tax_unit_spouse"] = {self.year: True}
-        for dep in dependents:
-            people[dep]["is_tax_unit_dependent"] = {self.year: True}
 
         household_dict = {
-            "members": household_members,
+            "members": person_ids,
             "state_code": {self.year: self.state},
         }
         if self.county:
@@ -146,8 +150,8 @@ class Household:
         return {
             "people": people,
             "tax_units": {"tax_unit": tax_unit},
-            "families": {"family": {"members": family_members}},
-            "spm_units": {"spm_unit": {"members": spm_unit_members}},
+            "families": {"family": {"members": person_ids}},
+            "spm_units": {"spm_unit": {"members": person_ids}},
             "households": {"household": household_dict},
         }
 
@@ -155,7 +159,7 @@ class Household:
         """Create a deep copy of this household."""
         return Household(
             state=self.state,
-            members=[copy.deepcopy(m) for m in self.members],
+            members=[m.clone() for m in self.members],
             year=self.year,
             county=self.county,
             zip_code=self.zip_code,
@@ -166,6 +170,31 @@ class Household:
         self.members.append(person)
         self._assign_tax_unit_roles()
 
+    def add_members(self, people: Iterable[Person]) -> None:
+        """Add several members, assigning tax unit roles once at the end."""
+        self.members.extend(people)
+        self._assign_tax_unit_roles()
+
+    def remove_members(self, indices: set[int]) -> None:
+        """Remove the members at the given indices."""
+        self.members[:] = [m for i, m in enumerate(self.members) if i not in indices]
+        self._assign_tax_unit_roles()
+
+    def spouse_index(self) -> int | None:
+        """Return the index of the tax unit spouse in members, or None."""
+        for i, member in enumerate(self.members):
+            if member.is_tax_unit_spouse:
+                return i
+        return None
+
+    @property
+    def has_spouse(self) -> bool:
+        """Whether the household has a tax unit spouse."""
+        for member in self.members:
+            if member.is_tax_unit_spouse:
+                return True
+        return False
+
     @property
     def adults(self) -> list[Person]:
         """Return all adult members (age >= 18)."""
@@ -1,7 +1,10 @@
 """Shared metadata for variable labels, categories, and priorities."""
 
-# Variable metadata: label, category, priority (1=primary, 2=secondary)
-VARIABLE_METADATA = {
+from types import MappingProxyType
+
+# Variable metadata: label, category, priority (1=primary, 2=secondary).
+# Read-only so lookup tables derived from it at import time can't go stale.
+VARIABLE_METADATA = MappingProxyType({
     # Income
     "household_net_income": ("Net Income", "income", 1),
     "employment_income": ("Employment Income", "income", 1),
@@ -106,19 +109,65 @@ VARIABLE_METADATA = {
     "hi_eitc": ("HI EITC", "state_credit", 1),
     "ut_eitc": ("UT EITC", "state_credit", 1),
     "ut_ctc": ("UT Child Tax Credit", "state_credit", 1),
+})
+
+# Frontend totals: each category counts toward at most one of these buckets
+TAX_BUCKET, BENEFIT_BUCKET, OTHER_BUCKET = 0, 1, 2
+_CATEGORY_BUCKET = {
+    "tax": TAX_BUCKET,
+    "benefit": BENEFIT_BUCKET,
+    "credit": BENEFIT_BUCKET,
+}
+
+# Bucket per variable, for one lookup per variable when totaling. A plain
+# dict: the formatter looks up every variable, so skip the proxy indirection.
+VAR_TO_BUCKET = {
+    name: _CATEGORY_BUCKET.get(category, OTHER_BUCKET)
+    for name, (_, category, _) in VARIABLE_METADATA.items()
 }
 
+# Defaults for variables missing from VARIABLE_METADATA (label is the name)
+_DEFAULT_CATEGORY = "benefit"
+_DEFAULT_PRIORITY = 2
+
+# Plain-dict copy for the response path, skipping the proxy indirection
+_METADATA = dict(VARIABLE_METADATA)
+
+# Per-field lookup tables so each accessor is a single dict lookup
+_LABELS = {name: label for name, (label, _, _) in VARIABLE_METADATA.items()}
+_CATEGORIES = {
+    name: category for name, (_, category, _) in VARIABLE_METADATA.items()
+}
+_PRIORITIES = {
+    name: priority for name, (_, _, priority) in VARIABLE_METADATA.items()
+}
+
+# Bound lookups, resolved once rather than on every accessor call
+_metadata_get = _METADATA.get
+_label_get = _LABELS.get
+_category_get = _CATEGORIES.get
+_priority_get = _PRIORITIES.get
+
+
+def get_metadata(var_name: str) -> tuple[str, str, int]:
+    """Get (label, category, priority) for a variable in a single lookup."""
+    metadata = _metadata_get(var_name)
+    if metadata is None:
+        return (var_name, _DEFAULT_CATEGORY, _DEFAULT_PRIORITY)
+    return metadata
+
 
 def get_label(var_name: str) -> str:
     """Get human-readable label for a variable."""
-    return VARIABLE_METADATA.get(var_name, (var_name, "benefit", 2))[0]
+    return _label_get(var_name, var_name)
 
 
 def get_category(var_name: str) -> str:
     """Get category for a variable (tax, benefit, credit, etc)."""
-    return VARIABLE_METADATA.get(var_name, (var_name, "benefit", 2))[1]
+    return _category_get(var_name, _DEFAULT_CATEGORY)
 
 
 def get_priority(var_name: str) -> int:
     """Get display priority for a variable (1=primary, 2=secondary)."""
-    return VARIABLE_METADATA.get(var_name, (var_name, "benefit", 2))[2]
+    return _priority_get(var_name, _DEFAULT_PRIORITY)
+
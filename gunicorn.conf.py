@@ -0,0 +1,21 @@
+"""Gunicorn configuration for the Crossroads API."""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+
+# One process per core so simulations run in parallel, with a few threads
+# each so cheap requests (health checks, cache hits) aren't stuck behind them
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = 4
+
+# With a worker per core, each worker should run one simulation at a time
+os.environ.setdefault("CROSSROADS_MAX_CONCURRENT_SIMULATIONS", "1")
+
+# Cliff analyses run dozens of simulations in one request
+timeout = 120
+
+# Import the app (and PolicyEngine) once in the master before forking
+preload_app = True
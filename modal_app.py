@@ -2,40 +2,32 @@
 
 import hashlib
 import json
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
 import modal
 
 app = modal.App("crossroads-api")
 
 image = (
     modal.Image.debian_slim(python_version="3.11")
-    .pip_install("policyengine-us>=1.0.0", "fastapi")
+    .pip_install("policyengine-us>=1.0.0", "fastapi", "orjson")
     .add_local_dir("crossroads", "/root/crossroads")
 )
 
-# Persistent cache for simulation results (survives container restarts)
-cache = modal.Dict.from_name("crossroads-cache", create_if_missing=True)
-
-
-def get_cache_key(data: dict) -> str:
-    """Generate a cache key from the request data."""
-    # Normalize and hash the request
-    normalized = json.dumps(data, sort_keys=True)
-    return hashlib.md5(normalized.encode()).hexdigest()
+# Health checks don't need PolicyEngine, so their cold starts skip loading it
+health_image = modal.Image.debian_slim(python_version="3.11").pip_install("fastapi")
 
-
-@app.function(
-    image=image,
-    min_containers=1,
-    timeout=300,
-    memory=2048,
-)
-@modal.fastapi_endpoint(method="POST", docs=True)
-def simulate(data: dict) -> dict:
-    """Run a life event simulation."""
-    import sys
+# Import the package once per container rather than on every request.
+# In health containers, and locally if crossroads' dependencies aren't
+# installed, these imports fail quietly and the rest of the block is skipped.
+with image.imports():
     sys.path.insert(0, "/root")
 
-    from crossroads.compare import compare
+    from fastapi.responses import ORJSONResponse
+
+    from crossroads.compare import calculate_cliff_analysis, compare, warm_up
     from crossroads.events import (
         ChildAgingOut,
         Divorce,
@@ -50,8 +42,8 @@ def simulate(data: dict) -> dict:
         Unemployment,
     )
     from crossroads.events.base import LifeEvent
-    from dataclasses import dataclass
-    from typing import Optional
+    from crossroads.frontend import format_result_for_frontend
+    from crossroads.household import Household, Person
 
     @dataclass
     class IncomeChange(LifeEvent):
@@ -87,148 +79,141 @@ def simulate(data: dict) -> dict:
             if self.new_spouse_income is not None and self.new_spouse_income < 0:
                 errors.append("Spouse income cannot be negative")
             return errors
-    from crossroads.household import Household, Person
-    from crossroads.metadata import get_category, get_label, get_priority
 
-    def create_household_from_request(data: dict) -> Household:
-        """Convert frontend household format to backend Household."""
-        members = []
+    # Events whose constructors take no request parameters
+    _NO_ARG_EVENTS = {
+        "having_baby": NewChild,
+        "retiring": Retirement,
+        "divorce": Divorce,
+        "pregnancy": Pregnancy,
+        "medicare_transition": MedicareTransition,
+        "child_aging_out": ChildAgingOut,
+        "losing_esi": LosingESI,
+    }
 
-        head = Person(
-            age=data.get("age", 30),
-            employment_income=data.get("income", 0),
-            is_tax_unit_head=True,
-            has_esi=data.get("hasESI", False),
-        )
-        members.append(head)
-
-        filing_status = data.get("filingStatus", "single")
-        if filing_status in ("married_jointly", "married_separately"):
-            spouse = Person(
-                age=data.get("spouseAge", data.get("age", 30)),
-                employment_income=data.get("spouseIncome", 0),
-                is_tax_unit_spouse=True,
-                has_esi=data.get("spouseHasESI", False),
-            )
-            members.append(spouse)
-
-        for age in data.get("childAges", []):
-            members.append(Person(age=age))
-
-        return Household(
-            state=data.get("state", "CA"),
-            members=members,
-            year=data.get("year", 2025),
-        )
+    # Run one small simulation when a simulate or cliff container boots,
+    # moving PolicyEngine's one-time setup out of the first request
+    if not modal.is_local():
+        warm_up()
 
-    def create_event_from_request(event_type: str, params: dict, household: Household):
-        """Convert frontend event type to backend LifeEvent."""
-        event_map = {
-            "having_baby": lambda: NewChild(),
-            "moving_states": lambda: Move(new_state=params.get("newState", "TX")),
-            "getting_married": lambda: Marriage(
-                spouse_age=params.get("spouseAge", 30),
-                spouse_employment_income=params.get("spouseIncome", 0),
-                spouse_children=[Person(age=age) for age in params.get("spouseChildAges", [])],
-                spouse_has_esi=params.get("spouseHasESI", False),
-            ),
-            "changing_income": lambda: IncomeChange(
-                new_head_income=params.get("newIncome"),
-                new_spouse_income=params.get("newSpouseIncome"),
-            ),
-            "retiring": lambda: Retirement(),
-            "divorce": lambda: Divorce(),
-            "pregnancy": lambda: Pregnancy(),
-            "unemployment": lambda: Unemployment(
-                unemployment_compensation=params.get("unemploymentBenefits", 15000)
-            ),
-            "medicare_transition": lambda: MedicareTransition(),
-            "child_aging_out": lambda: ChildAgingOut(),
-            "losing_esi": lambda: LosingESI(),
-        }
-
-        if event_type not in event_map:
-            raise ValueError(f"Unknown event type: {event_type}")
-
-        return event_map[event_type]()
-
-    def format_result_for_frontend(result) -> dict:
-        """Convert ComparisonResult to frontend-expected format."""
-        metrics = []
-        for var_name, change in result.changes.items():
-            if var_name == "household_net_income":
-                continue
-            metrics.append({
-                "name": var_name,
-                "label": get_label(var_name),
-                "before": change.before,
-                "after": change.after,
-                "category": get_category(var_name),
-                "priority": get_priority(var_name),
-            })
-
-        total_tax_before = sum(
-            c.before for name, c in result.changes.items() if get_category(name) == "tax"
-        )
-        total_tax_after = sum(
-            c.after for name, c in result.changes.items() if get_category(name) == "tax"
-        )
-        total_benefits_before = sum(
-            c.before for name, c in result.changes.items()
-            if get_category(name) in ("benefit", "credit")
-        )
-        total_benefits_after = sum(
-            c.after for name, c in result.changes.items()
-            if get_category(name) in ("benefit", "credit")
+
+# Persistent cache for simulation results (survives container restarts)
+cache = modal.Dict.from_name("crossroads-cache", create_if_missing=True)
+
+
+def get_cache_key(data: dict) -> str:
+    """Generate a cache key from the request data."""
+    # Normalize and hash the request
+    normalized = json.dumps(data, sort_keys=True)
+    return hashlib.md5(normalized.encode()).hexdigest()
+
+
+def create_household_from_request(data: dict):
+    """Convert frontend household format to backend Household."""
+    members = []
+
+    age = data.get("age", 30)
+    head = Person(
+        age=age,
+        employment_income=data.get("income", 0),
+        is_tax_unit_head=True,
+        has_esi=data.get("hasESI", False),
+    )
+    members.append(head)
+
+    filing_status = data.get("filingStatus", "single")
+    if filing_status in ("married_jointly", "married_separately"):
+        spouse_age = data.get("spouseAge")
+        spouse = Person(
+            age=age if spouse_age is None else spouse_age,
+            employment_income=data.get("spouseIncome", 0),
+            is_tax_unit_spouse=True,
+            has_esi=data.get("spouseHasESI", False),
         )
+        members.append(spouse)
+
+    for child_age in data.get("childAges", []):
+        members.append(Person(age=child_age))
+
+    return Household(
+        state=data.get("state", "CA"),
+        members=members,
+        year=data.get("year", 2025),
+    )
+
+
+def _build_move(params: dict, household):
+    return Move(new_state=params.get("newState", "TX"))
+
+
+def _build_marriage(params: dict, household):
+    return Marriage(
+        spouse_age=params.get("spouseAge", 30),
+        spouse_employment_income=params.get("spouseIncome", 0),
+        spouse_children=[Person(age=age) for age in params.get("spouseChildAges", [])],
+        spouse_has_esi=params.get("spouseHasESI", False),
+    )
+
+
+def _build_income_change(params: dict, household):
+    return IncomeChange(
+        new_head_income=params.get("newIncome"),
+        new_spouse_income=params.get("newSpouseIncome"),
+    )
+
+
+def _build_unemployment(params: dict, household):
+    return Unemployment(
+        unemployment_compensation=params.get("unemploymentBenefits", 15000)
+    )
+
+
+# Frontend event type -> builder taking the request params and household
+_EVENT_BUILDERS = {
+    "moving_states": _build_move,
+    "getting_married": _build_marriage,
+    "changing_income": _build_income_change,
+    "unemployment": _build_unemployment,
+}
 
-        response = {
-            "before": {
-                "netIncome": result.net_income_before,
-                "totalTax": total_tax_before,
-                "totalBenefits": total_benefits_before,
-                "metrics": metrics,
-            },
-            "after": {
-                "netIncome": result.net_income_after,
-                "totalTax": total_tax_after,
-                "totalBenefits": total_benefits_after,
-                "metrics": [{**m, "before": m["after"]} for m in metrics],
-            },
-            "diff": {
-                "netIncome": result.net_income_change,
-                "totalTax": total_tax_after - total_tax_before,
-                "totalBenefits": total_benefits_after - total_benefits_before,
-            },
-            "event": {
-                "name": result.event.name,
-                "description": result.event.description,
-            },
-        }
-
-        # Add healthcare coverage info if available
-        if result.healthcare_before:
-            response["healthcareBefore"] = result.healthcare_before.to_dict()
-        if result.healthcare_after:
-            response["healthcareAfter"] = result.healthcare_after.to_dict()
-
-        return response
 
+def create_event_from_request(event_type: str, params: dict, household):
+    """Convert frontend event type to backend LifeEvent."""
+    event_cls = _NO_ARG_EVENTS.get(event_type)
+    if event_cls is not None:
+        return event_cls()
+
+    builder = _EVENT_BUILDERS.get(event_type)
+    if builder is None:
+        raise ValueError(f"Unknown event type: {event_type}")
+    return builder(params, household)
+
+
+@app.function(
+    image=image,
+    min_containers=1,
+    timeout=300,
+    memory=2048,
+)
+@modal.fastapi_endpoint(method="POST", docs=True)
+def simulate(data: dict):
+    """Run a life event simulation."""
     try:
         # Check cache first
         cache_key = get_cache_key(data)
         try:
             cached = cache[cache_key]
             if cached:
-                return cached
+                return ORJSONResponse(cached)
         except KeyError:
             pass  # Not in cache
 
         # Run simulation
-        household = create_household_from_request(data.get("household", {}))
+        event_data = data.get("lifeEvent") or {}
+        household = create_household_from_request(data.get("household") or {})
         event = create_event_from_request(
-            data.get("lifeEvent", {}).get("type"),
-            data.get("lifeEvent", {}).get("params", {}),
+            event_data.get("type"),
+            event_data.get("params") or {},
             household,
         )
         result = compare(household, event)
@@ -240,7 +225,7 @@ def simulate(data: dict) -> dict:
         except Exception:
             pass  # Don't fail if caching fails
 
-        return response
+        return ORJSONResponse(response)
     except ValueError as e:
         return {"error": str(e)}
     except Exception as e:
@@ -253,42 +238,10 @@ def simulate(data: dict) -> dict:
     memory=2048,
 )
 @modal.fastapi_endpoint(method="POST", docs=True)
-def cliff(data: dict) -> dict:
+def cliff(data: dict):
     """Calculate benefit cliffs across income levels using PolicyEngine."""
-    import sys
-    sys.path.insert(0, "/root")
-
-    from crossroads.compare import calculate_cliff_analysis
-    from crossroads.household import Household, Person
-
-    def create_hh(data: dict) -> Household:
-        members = []
-        head = Person(
-            age=data.get("age", 30),
-            employment_income=data.get("income", 0),
-            is_tax_unit_head=True,
-            has_esi=data.get("hasESI", False),
-        )
-        members.append(head)
-        filing_status = data.get("filingStatus", "single")
-        if filing_status in ("married_jointly", "married_separately"):
-            spouse = Person(
-                age=data.get("spouseAge", data.get("age", 30)),
-                employment_income=data.get("spouseIncome", 0),
-                is_tax_unit_spouse=True,
-                has_esi=data.get("spouseHasESI", False),
-            )
-            members.append(spouse)
-        for age in data.get("childAges", []):
-            members.append(Person(age=age))
-        return Household(
-            state=data.get("state", "CA"),
-            members=members,
-            year=data.get("year", 2025),
-        )
-
     try:
-        household = create_hh(data.get("household", {}))
+        household = create_household_from_request(data.get("household") or {})
         income_min = data.get("incomeMin", 0)
         income_max = data.get("incomeMax", 150000)
         num_points = min(data.get("numPoints", 30), 50)
@@ -299,14 +252,14 @@ def cliff(data: dict) -> dict:
             num_points=num_points,
         )
         current_income = household.members[0].employment_income if household.members else 0
-        return {"data": results, "currentIncome": current_income}
+        return ORJSONResponse({"data": results, "currentIncome": current_income})
     except ValueError as e:
         return {"error": str(e)}
     except Exception as e:
         return {"error": f"Cliff analysis failed: {str(e)}"}
 
 
-@app.function(image=image)
+@app.function(image=health_image)
 @modal.fastapi_endpoint(method="GET", docs=True)
 def health() -> dict:
     """Health check endpoint."""
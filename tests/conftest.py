@@ -0,0 +1,34 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from crossroads.compare import warm_up
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--slow",
+        action="store_true",
+        default=False,
+        help="run the full set of per-event compare() smoke tests",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def warm_policyengine():
+    """Run one small simulation so PolicyEngine's one-time setup is paid once.
+
+    Parameter and formula caches are filled lazily by the first simulation;
+    under pytest-xdist each worker warms up once instead of charging the cost
+    to whichever test happens to run first.
+    """
+    warm_up()
@@ -0,0 +1,82 @@
+"""Tests for the Flask API's request handling."""
+
+import gzip
+
+import orjson
+import pytest
+
+from crossroads.api import COMPRESS_MIN_SIZE, app
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def unknown_event_body(event_type="not_an_event"):
+    return {"household": {"state": "CA"}, "lifeEvent": {"type": event_type}}
+
+
+class TestRequestErrors:
+    """Tests for error responses."""
+
+    def test_malformed_json_returns_400(self, client):
+        """A body that isn't valid JSON is rejected."""
+        response = client.post(
+            "/api/simulate", data="{not json", content_type="application/json"
+        )
+        assert response.status_code == 400
+        assert "JSON object" in response.get_json()["error"]
+
+    def test_non_object_json_returns_400(self, client):
+        """A JSON body that isn't an object is rejected."""
+        response = client.post("/api/cliff", json=[1, 2, 3])
+        assert response.status_code == 400
+        assert "JSON object" in response.get_json()["error"]
+
+    def test_unknown_event_returns_400(self, client):
+        """An unknown life event type is reported as a client error."""
+        response = client.post("/api/simulate", json=unknown_event_body())
+        assert response.status_code == 400
+        assert "Unknown event type" in response.get_json()["error"]
+
+    def test_unknown_route_returns_404(self, client):
+        """HTTP errors pass through the catch-all handler unchanged."""
+        response = client.get("/api/does-not-exist")
+        assert response.status_code == 404
+
+
+class TestCompression:
+    """Tests for gzip response negotiation."""
+
+    # An unknown event echoes its type, giving a large response cheaply
+    LARGE_BODY = unknown_event_body("x" * COMPRESS_MIN_SIZE)
+
+    def test_large_response_gzipped_when_accepted(self, client):
+        """Large JSON responses are gzipped for clients that accept it."""
+        response = client.post(
+            "/api/simulate", json=self.LARGE_BODY, headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        parsed = orjson.loads(gzip.decompress(response.get_data()))
+        assert "Unknown event type" in parsed["error"]
+
+    @pytest.mark.parametrize(
+        "accept_encoding",
+        [None, "gzip;q=0", "br"],
+        ids=["no_header", "gzip_refused", "other_encoding"],
+    )
+    def test_large_response_not_gzipped_otherwise(self, client, accept_encoding):
+        """Responses stay uncompressed unless gzip is acceptable."""
+        headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+        response = client.post("/api/simulate", json=self.LARGE_BODY, headers=headers)
+        assert "Content-Encoding" not in response.headers
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert "Unknown event type" in response.get_json()["error"]
+
+    def test_small_response_not_gzipped(self, client):
+        """Responses under COMPRESS_MIN_SIZE aren't worth compressing."""
+        response = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+        assert response.get_json() == {"status": "ok"}
@@ -1,6 +1,8 @@
 """Smoke tests for the compare function."""
 
+import importlib
 import json
+import os
 
 import pytest
 
@@ -18,8 +20,10 @@ from crossroads.events import (
     Unemployment,
 )
 
+pytestmark = pytest.mark.usefixtures("warm_policyengine")
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def single_adult_household():
     """A single adult household in California."""
     return Household(
@@ -28,7 +32,7 @@ def single_adult_household():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def married_household():
     """A married couple household in California."""
     return Household(
@@ -40,7 +44,7 @@ def married_household():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def family_household():
     """A family with children in California."""
     return Household(
@@ -54,196 +58,203 @@ def family_household():
     )
 
 
-class TestCompareNewChild:
-    """Tests for NewChild life event."""
-
-    def test_new_child_runs(self, single_adult_household):
-        """Smoke test: compare() runs without error for NewChild."""
-        result = compare(single_adult_household, NewChild())
-        assert result is not None
-        assert result.event.name == "New Child"
-
-    def test_new_child_adds_member(self, single_adult_household):
-        """NewChild should add a member to the household."""
-        event = NewChild(age=0)
-        result = compare(single_adult_household, event)
-        # After situation should have more people
-        before_people = len(result.before_situation["people"])
-        after_people = len(result.after_situation["people"])
-        assert after_people == before_people + 1
-
-
-class TestCompareMove:
-    """Tests for Move life event."""
-
-    def test_move_runs(self, single_adult_household):
-        """Smoke test: compare() runs without error for Move."""
-        result = compare(single_adult_household, Move(new_state="TX"))
-        assert result is not None
-        assert result.event.name == "Move"
-
-    def test_move_changes_state(self, single_adult_household):
-        """Move should change the state in the situation."""
-        result = compare(single_adult_household, Move(new_state="TX"))
-        after_state = result.after_situation["households"]["household"]["state_code"]
-        assert after_state[2024] == "TX"
-
-
-class TestCompareMarriage:
-    """Tests for Marriage life event."""
+@pytest.fixture(scope="session")
+def pre_retirement_household():
+    """A single adult about to turn 65 in California."""
+    return Household(
+        state="CA",
+        members=[Person(age=64, employment_income=80000)],
+    )
 
-    def test_marriage_runs(self, single_adult_household):
-        """Smoke test: compare() runs without error for Marriage."""
-        result = compare(
-            single_adult_household,
-            Marriage(spouse_age=28, spouse_employment_income=45000),
-        )
-        assert result is not None
-        assert result.event.name == "Marriage"
-
-    def test_marriage_adds_spouse(self, single_adult_household):
-        """Marriage should add a spouse to the household."""
-        result = compare(
-            single_adult_household,
-            Marriage(spouse_age=28, spouse_employment_income=45000),
-        )
-        before_people = len(result.before_situation["people"])
-        after_people = len(result.after_situation["people"])
-        assert after_people == before_people + 1
 
+@pytest.fixture(scope="session")
+def turning_65_household():
+    """A single adult on a moderate income about to turn 65 in California."""
+    return Household(
+        state="CA",
+        members=[Person(age=64, employment_income=50000)],
+    )
 
-class TestCompareDivorce:
-    """Tests for Divorce life event."""
 
-    def test_divorce_runs(self, married_household):
-        """Smoke test: compare() runs without error for Divorce."""
-        result = compare(married_household, Divorce())
+@pytest.fixture(scope="session")
+def compare_cached():
+    """compare(), memoized per (household, event) for tests that only read results."""
+    results = {}
+
+    def cached(household, event):
+        key = (id(household), repr(event))
+        if key not in results:
+            results[key] = compare(household, event)
+        return results[key]
+
+    return cached
+
+
+# (household fixture, event, expected event name)
+EVENT_CASES = [
+    pytest.param("single_adult_household", NewChild(), "New Child", id="new_child"),
+    pytest.param(
+        "single_adult_household",
+        Move(new_state="TX"),
+        "Move",
+        id="move",
+        marks=pytest.mark.slow,
+    ),
+    pytest.param(
+        "single_adult_household",
+        Marriage(spouse_age=28, spouse_employment_income=45000),
+        "Marriage",
+        id="marriage",
+        marks=pytest.mark.slow,
+    ),
+    pytest.param(
+        "married_household",
+        Divorce(),
+        "Divorce",
+        id="divorce",
+        marks=pytest.mark.slow,
+    ),
+    pytest.param(
+        "single_adult_household",
+        JobChange(new_employment_income=75000),
+        "Job Change",
+        id="job_change",
+        marks=pytest.mark.slow,
+    ),
+    pytest.param(
+        "single_adult_household",
+        Unemployment(unemployment_compensation=20000),
+        "Unemployment",
+        id="unemployment",
+        marks=pytest.mark.slow,
+    ),
+    pytest.param(
+        "pre_retirement_household",
+        Retirement(social_security_amount=30000),
+        "Retirement",
+        id="retirement",
+        marks=pytest.mark.slow,
+    ),
+    pytest.param(
+        "single_adult_household",
+        Pregnancy(),
+        "Pregnancy",
+        id="pregnancy",
+        marks=pytest.mark.slow,
+    ),
+    pytest.param(
+        "turning_65_household",
+        MedicareTransition(),
+        "Medicare Transition",
+        id="medicare_transition",
+        marks=pytest.mark.slow,
+    ),
+    pytest.param(
+        "family_household",
+        ChildAgingOut(member_index=2),
+        "Child Aging Out",
+        id="child_aging_out",
+        marks=pytest.mark.slow,
+    ),
+]
+
+# (household fixture, event, expected change in household size)
+MEMBER_CHANGE_CASES = [
+    pytest.param("single_adult_household", NewChild(), 1, id="new_child"),
+    pytest.param(
+        "single_adult_household",
+        Marriage(spouse_age=28, spouse_employment_income=45000),
+        1,
+        id="marriage",
+        marks=pytest.mark.slow,
+    ),
+    pytest.param(
+        "married_household",
+        Divorce(),
+        -1,
+        id="divorce",
+        marks=pytest.mark.slow,
+    ),
+]
+
+
+class TestCompareEvents:
+    """Smoke tests for each life event."""
+
+    @pytest.mark.parametrize("household_fixture, event, expected_name", EVENT_CASES)
+    def test_event_runs(
+        self, request, compare_cached, household_fixture, event, expected_name
+    ):
+        """compare() runs without error for every life event."""
+        household = request.getfixturevalue(household_fixture)
+        result = compare_cached(household, event)
         assert result is not None
-        assert result.event.name == "Divorce"
+        assert result.event.name == expected_name
 
-    def test_divorce_removes_spouse(self, married_household):
-        """Divorce should remove the spouse from the household."""
-        result = compare(married_household, Divorce())
+    @pytest.mark.parametrize(
+        "household_fixture, event, expected_delta", MEMBER_CHANGE_CASES
+    )
+    def test_event_changes_members(
+        self, request, compare_cached, household_fixture, event, expected_delta
+    ):
+        """Events that add or remove people should change the household size."""
+        household = request.getfixturevalue(household_fixture)
+        result = compare_cached(household, event)
         before_people = len(result.before_situation["people"])
         after_people = len(result.after_situation["people"])
-        assert after_people == before_people - 1
-
-
-class TestCompareJobChange:
-    """Tests for JobChange life event."""
-
-    def test_job_change_runs(self, single_adult_household):
-        """Smoke test: compare() runs without error for JobChange."""
-        result = compare(
-            single_adult_household, JobChange(new_employment_income=75000)
-        )
-        assert result is not None
-        assert result.event.name == "Job Change"
-
-
-class TestCompareUnemployment:
-    """Tests for Unemployment life event."""
-
-    def test_unemployment_runs(self, single_adult_household):
-        """Smoke test: compare() runs without error for Unemployment."""
-        result = compare(
-            single_adult_household, Unemployment(unemployment_compensation=20000)
-        )
-        assert result is not None
-        assert result.event.name == "Unemployment"
-
-
-class TestCompareRetirement:
-    """Tests for Retirement life event."""
-
-    def test_retirement_runs(self):
-        """Smoke test: compare() runs without error for Retirement."""
-        household = Household(
-            state="CA",
-            members=[Person(age=64, employment_income=80000)],
-        )
-        result = compare(household, Retirement(social_security_amount=30000))
-        assert result is not None
-        assert result.event.name == "Retirement"
-
-
-class TestComparePregnancy:
-    """Tests for Pregnancy life event."""
-
-    def test_pregnancy_runs(self, single_adult_household):
-        """Smoke test: compare() runs without error for Pregnancy."""
-        result = compare(single_adult_household, Pregnancy())
-        assert result is not None
-        assert result.event.name == "Pregnancy"
-
-
-class TestCompareMedicareTransition:
-    """Tests for MedicareTransition life event."""
-
-    def test_medicare_transition_runs(self):
-        """Smoke test: compare() runs without error for MedicareTransition."""
-        household = Household(
-            state="CA",
-            members=[Person(age=64, employment_income=50000)],
-        )
-        result = compare(household, MedicareTransition())
-        assert result is not None
-        assert result.event.name == "Medicare Transition"
+        assert after_people == before_people + expected_delta
 
+    @pytest.mark.slow
+    def test_move_changes_state(self, single_adult_household, compare_cached):
+        """Move should change the state in the situation."""
+        result = compare_cached(single_adult_household, Move(new_state="TX"))
+        after_state = result.after_situation["households"]["household"]["state_code"]
+        assert after_state[2024] == "TX"
 
-class TestCompareChildAgingOut:
-    """Tests for ChildAgingOut life event."""
 
-    def test_child_aging_out_runs(self, family_household):
-        """Smoke test: compare() runs without error for ChildAgingOut."""
-        result = compare(family_household, ChildAgingOut(member_index=2))
-        assert result is not None
-        assert result.event.name == "Child Aging Out"
+@pytest.fixture(scope="class")
+def new_child_result(single_adult_household, compare_cached):
+    """One NewChild comparison shared by every test in a class."""
+    return compare_cached(single_adult_household, NewChild())
 
 
 class TestComparisonResultSerialization:
     """Tests for ComparisonResult JSON serialization."""
 
-    def test_to_dict_is_json_serializable(self, single_adult_household):
+    def test_to_dict_is_json_serializable(self, new_child_result):
         """ComparisonResult.to_dict() should be JSON-serializable."""
-        result = compare(single_adult_household, NewChild())
-        result_dict = result.to_dict()
+        result_dict = new_child_result.to_dict()
+
+        # Should not raise; stream the encoding rather than building the string
+        for _ in json.JSONEncoder().iterencode(result_dict):
+            pass
 
-        # Should not raise
-        json_str = json.dumps(result_dict)
-        assert json_str is not None
+        assert result_dict["event"]["name"] == "New Child"
+        assert "summary" in result_dict
+        assert "net_income" in result_dict["summary"]
+        assert "tax_liability" in result_dict["summary"]
 
-        # Should round-trip
-        parsed = json.loads(json_str)
-        assert parsed["event"]["name"] == "New Child"
-        assert "summary" in parsed
-        assert "net_income" in parsed["summary"]
-        assert "tax_liability" in parsed["summary"]
+    def test_to_json_matches_to_dict(self, new_child_result):
+        """ComparisonResult.to_json() should encode the same data as to_dict()."""
+        parsed = json.loads(new_child_result.to_json())
+        assert parsed == json.loads(json.dumps(new_child_result.to_dict()))
 
-    def test_to_dict_structure(self, single_adult_household):
+    def test_to_dict_structure(self, new_child_result):
         """ComparisonResult.to_dict() should have expected structure."""
-        result = compare(single_adult_household, NewChild())
-        result_dict = result.to_dict()
-
-        # Top-level keys
-        assert "event" in result_dict
-        assert "before_situation" in result_dict
-        assert "after_situation" in result_dict
-        assert "changes" in result_dict
-        assert "summary" in result_dict
+        result_dict = new_child_result.to_dict()
 
-        # Event structure
-        assert "name" in result_dict["event"]
-        assert "description" in result_dict["event"]
-        assert "type" in result_dict["event"]
+        assert {
+            "event",
+            "before_situation",
+            "after_situation",
+            "changes",
+            "summary",
+        } <= result_dict.keys()
+        assert {"name", "description", "type"} <= result_dict["event"].keys()
 
-        # Summary structure
         summary = result_dict["summary"]
-        assert "before" in summary["net_income"]
-        assert "after" in summary["net_income"]
-        assert "change" in summary["net_income"]
-        assert "new_benefits" in summary
-        assert "lost_benefits" in summary
+        assert {"before", "after", "change"} <= summary["net_income"].keys()
+        assert {"new_benefits", "lost_benefits"} <= summary.keys()
 
 
 class TestValidationErrors:
@@ -263,3 +274,31 @@ class TestValidationErrors:
         """Moving to the same state should raise ValueError."""
         with pytest.raises(ValueError, match="same as current"):
             compare(single_adult_household, Move(new_state="CA"))
+
+
+class TestSimulationPool:
+    """Tests for the optional simulation process pool."""
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_pool_not_inherited_across_fork(self, monkeypatch):
+        """A forked child must not reuse its parent's process pool."""
+        compare_module = importlib.import_module("crossroads.compare")
+        monkeypatch.setattr(compare_module, "_simulation_pool", object())
+
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if compare_module._simulation_pool is None else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+
+    @pytest.mark.slow
+    def test_warm_up_bypasses_pool(self, monkeypatch):
+        """warm_up() simulates in-process even when the pool is enabled."""
+        compare_module = importlib.import_module("crossroads.compare")
+
+        def no_pool():
+            raise AssertionError("warm_up() should not use the process pool")
+
+        monkeypatch.setattr(compare_module, "PARALLEL_SIMULATIONS", True)
+        monkeypatch.setattr(compare_module, "_get_simulation_pool", no_pool)
+        compare_module.warm_up()
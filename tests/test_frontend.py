@@ -0,0 +1,50 @@
+"""Tests for the shared frontend response formatter."""
+
+from crossroads import BenefitChange, ComparisonResult
+from crossroads.events import NewChild
+from crossroads.frontend import format_result_for_frontend
+
+
+def make_result(**changes):
+    return ComparisonResult(
+        event=NewChild(),
+        before_situation={},
+        after_situation={},
+        changes={
+            name: BenefitChange(name, before, after)
+            for name, (before, after) in changes.items()
+        },
+    )
+
+
+class TestFormatResultForFrontend:
+    """Tests for format_result_for_frontend()."""
+
+    def test_totals_by_category(self):
+        """Taxes and benefits are totaled separately; net income is not a metric."""
+        result = make_result(
+            household_net_income=(50000, 52000),
+            income_tax=(4000, 3000),
+            snap=(0, 1000),
+        )
+        response = format_result_for_frontend(result)
+
+        assert response["before"]["netIncome"] == 50000
+        assert response["before"]["totalTax"] == 4000
+        assert response["after"]["totalTax"] == 3000
+        assert response["before"]["totalBenefits"] == 0
+        assert response["after"]["totalBenefits"] == 1000
+        assert response["diff"]["totalTax"] == -1000
+        assert [m.name for m in response["before"]["metrics"]] == [
+            "income_tax",
+            "snap",
+        ]
+
+    def test_unknown_variable_counts_as_benefit(self):
+        """Variables without metadata are reported and totaled as benefits."""
+        response = format_result_for_frontend(make_result(custom_benefit=(100, 200)))
+
+        (metric,) = response["before"]["metrics"]
+        assert metric.category == "benefit"
+        assert response["before"]["totalBenefits"] == 100
+        assert response["after"]["totalBenefits"] == 200
@@ -14,30 +14,62 @@ class TestPerson:
         assert person.age == 30
         assert person.employment_income == 50000
 
-    def test_person_to_situation_dict(self):
+    @pytest.mark.parametrize(
+        "kwargs, expected, absent",
+        [
+            pytest.param(
+                {
+                    "age": 30,
+                    "employment_income": 50000,
+                    "self_employment_income": 10000,
+                },
+                {
+                    "age": {2024: 30},
+                    "employment_income": {2024: 50000},
+                    "self_employment_income": {2024: 10000},
+                },
+                (),
+                id="incomes",
+            ),
+            pytest.param(
+                {"age": 28, "is_pregnant": True},
+                {"is_pregnant": {2024: True}},
+                (),
+                id="pregnant",
+            ),
+            pytest.param(
+                {"age": 28, "is_pregnant": False},
+                {},
+                ("is_pregnant",),
+                id="not_pregnant",
+            ),
+        ],
+    )
+    def test_person_to_situation_dict(self, kwargs, expected, absent):
         """Person.to_situation_dict() produces correct format."""
+        result = Person(**kwargs).to_situation_dict(2024)
+
+        for key, value in expected.items():
+            assert result[key] == value
+        for key in absent:
+            assert key not in result
+
+    def test_person_clone(self):
+        """Person.clone() copies every field into an independent Person."""
         person = Person(
-            age=30,
+            age=40,
             employment_income=50000,
-            self_employment_income=10000,
+            self_employment_income=1000,
+            social_security_retirement=200,
+            unemployment_compensation=300,
+            is_pregnant=True,
+            is_tax_unit_head=True,
+            has_esi=True,
         )
-        result = person.to_situation_dict(2024)
-
-        assert result["age"] == {2024: 30}
-        assert result["employment_income"] == {2024: 50000}
-        assert result["self_employment_income"] == {2024: 10000}
+        clone = person.clone()
 
-    def test_person_pregnancy_in_situation(self):
-        """Pregnant person includes is_pregnant in situation."""
-        person = Person(age=28, is_pregnant=True)
-        result = person.to_situation_dict(2024)
-        assert result["is_pregnant"] == {2024: True}
-
-    def test_person_not_pregnant_excludes_field(self):
-        """Non-pregnant person doesn't include is_pregnant."""
-        person = Person(age=28, is_pregnant=False)
-        result = person.to_situation_dict(2024)
-        assert "is_pregnant" not in result
+        assert clone == person
+        assert clone is not person
 
 
 class TestHousehold:
@@ -142,6 +174,41 @@ class TestHousehold:
         assert len(household.members) == 2
         assert household.members[1].age == 5
 
+    def test_household_add_members(self):
+        """Household.add_members() adds several members and assigns roles."""
+        household = Household(state="CA", members=[Person(age=30)])
+        household.add_members([Person(age=32), Person(age=4)])
+
+        assert [m.age for m in household.members] == [30, 32, 4]
+        assert household.members[0].is_tax_unit_head
+
+    def test_household_remove_members(self):
+        """Household.remove_members() removes members and reassigns roles."""
+        household = Household(
+            state="CA",
+            members=[Person(age=35), Person(age=10), Person(age=33)],
+        )
+        assert household.members[2].is_tax_unit_spouse
+
+        household.remove_members({1, 2})
+
+        assert [m.age for m in household.members] == [35]
+        assert household.members[0].is_tax_unit_head
+        assert not household.has_spouse
+
+    def test_household_has_spouse_after_direct_edits(self):
+        """Spouse lookups reflect edits made directly to members."""
+        household = Household(state="CA", members=[Person(age=30)])
+        assert not household.has_spouse
+
+        household.members.append(Person(age=28, is_tax_unit_spouse=True))
+        assert household.has_spouse
+        assert household.spouse_index() == 1
+
+        household.members[1].is_tax_unit_spouse = False
+        assert not household.has_spouse
+        assert household.spouse_index() is None
+
     def test_household_adults_property(self):
         """Household.adults returns only adult members."""
         household = Household(